@@ -1,11 +1,31 @@
+import sys
+
 from django.apps import AppConfig
 
+# Management commands that must not start the scheduler or auto-migrate.
+_MANAGE_COMMANDS = frozenset({
+    "migrate",
+    "makemigrations",
+    "shell",
+    "dbshell",
+    "check",
+    "collectstatic",
+    "createsuperuser",
+    "test",
+    "showmigrations",
+    "sqlmigrate",
+    "loaddata",
+    "dumpdata",
+})
+
 
 class ListingsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "listings"
 
     def ready(self):
+        from listings import signals  # noqa: F401  (connects receivers)
+
         # Skip scheduler for management commands (migrate, shell, check, …)
         if _is_manage_command():
             return
@@ -42,18 +62,4 @@ class ListingsConfig(AppConfig):
 
 def _is_manage_command() -> bool:
     """Return True when running a Django management command (migrate, shell, …)."""
-    import sys
-
-    argv = sys.argv
-    if len(argv) >= 2 and argv[1] in (
-        "migrate",
-        "makemigrations",
-        "shell",
-        "dbshell",
-        "check",
-        "collectstatic",
-        "createsuperuser",
-        "test",
-    ):
-        return True
-    return False
+    return len(sys.argv) >= 2 and sys.argv[1] in _MANAGE_COMMANDS
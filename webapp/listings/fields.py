@@ -0,0 +1,37 @@
+"""
+Custom model fields.
+"""
+import orjson
+from django.db import models
+from django.db.models.fields.json import KeyTransform
+
+
+class FastJSONField(models.JSONField):
+    """JSONField that encodes/decodes with orjson instead of the stdlib json module.
+
+    Falls back to the stock implementation when a custom encoder/decoder is set,
+    for query expressions, and on PostgreSQL (which adapts values as jsonb).
+    """
+
+    def from_db_value(self, value, expression, connection):
+        if value is None or self.decoder is not None:
+            return super().from_db_value(value, expression, connection)
+        # Some backends (SQLite at least) extract non-string values in their
+        # SQL datatypes.
+        if isinstance(expression, KeyTransform) and not isinstance(value, str):
+            return value
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            return value
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if (
+            self.encoder is not None
+            or hasattr(value, "as_sql")
+            or connection.vendor == "postgresql"
+        ):
+            return super().get_db_prep_value(value, connection, prepared)
+        if not prepared:
+            value = self.get_prep_value(value)
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
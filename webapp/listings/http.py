@@ -0,0 +1,43 @@
+"""
+HTTP response helpers.
+"""
+import orjson
+from django.http import HttpResponse, StreamingHttpResponse
+
+# Shared by every response; orjson output is compact by default, so there is
+# no per-call encoder or separator setup
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONResponse(HttpResponse):
+    """JsonResponse replacement that serializes *data* with orjson.
+
+    datetime / date / UUID values are emitted as ISO 8601 strings natively,
+    so views can pass them through without calling .isoformat().
+    """
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=orjson.dumps(data, option=_DUMPS_OPTIONS), **kwargs)
+
+
+class ORJSONStreamingResponse(StreamingHttpResponse):
+    """Stream ``{**data, key: [*rows]}`` as JSON, encoding one row at a time.
+
+    *rows* may be a generator, so the full list of row dicts and the full
+    encoded body never have to exist in memory at once.
+    """
+
+    def __init__(self, data, key, rows, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(self._chunks(data, key, rows), **kwargs)
+
+    @staticmethod
+    def _chunks(data, key, rows):
+        head = orjson.dumps(data, option=_DUMPS_OPTIONS)[:-1]  # drop the closing "}"
+        yield head + (b"," if len(head) > 1 else b"") + orjson.dumps(key) + b":["
+        sep = b""
+        for row in rows:
+            yield sep + orjson.dumps(row, option=_DUMPS_OPTIONS)
+            sep = b","
+        yield b"]}"
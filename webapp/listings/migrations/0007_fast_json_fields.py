@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:31
+
+import listings.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0006_ownedproperty_purchase_date'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='aianalysis',
+            name='analysis_json',
+            field=listings.fields.FastJSONField(),
+        ),
+        migrations.AlterField(
+            model_name='listing',
+            name='contact_info',
+            field=listings.fields.FastJSONField(blank=True, default=dict),
+        ),
+        migrations.AlterField(
+            model_name='listing',
+            name='images',
+            field=listings.fields.FastJSONField(blank=True, default=list),
+        ),
+        migrations.AlterField(
+            model_name='ownedproperty',
+            name='photos',
+            field=listings.fields.FastJSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_listing_count(apps, schema_editor):
+    SearchConfig = apps.get_model("listings", "SearchConfig")
+    Listing = apps.get_model("listings", "Listing")
+    counts = (
+        Listing.objects.filter(search_config=OuterRef("pk"))
+        .order_by()
+        .values("search_config")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    SearchConfig.objects.update(listing_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0007_fast_json_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="searchconfig",
+            name="listing_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_listing_count, migrations.RunPython.noop),
+    ]
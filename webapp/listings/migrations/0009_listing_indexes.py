@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0008_searchconfig_listing_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['first_seen'], name='listings_li_first_s_572065_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['search_config', 'first_seen'], name='listings_li_search__2a889a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['dispo', 'first_seen'], name='listings_li_dispo_7a5f58_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['price_czk'], name='listings_li_price_c_256378_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['area_m2'], name='listings_li_area_m2_005256_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['price_per_m2'], name='listings_li_price_p_21a1f4_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+import re
+
+from django.db import migrations, models
+
+# Same pattern as listings.models.room_count_from_dispo
+_RE_ROOM_COUNT = re.compile(r"(\d{1,4})\+")
+
+
+def fill_room_count(apps, schema_editor):
+    Listing = apps.get_model("listings", "Listing")
+    batch = []
+    for listing in Listing.objects.exclude(dispo="").only("pk", "dispo").iterator(chunk_size=2000):
+        m = _RE_ROOM_COUNT.match(listing.dispo)
+        if m:
+            listing.room_count = int(m.group(1))
+            batch.append(listing)
+    Listing.objects.bulk_update(batch, ["room_count"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0009_listing_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="listing",
+            name="room_count",
+            field=models.SmallIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_room_count, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,19 @@
+import re
+from datetime import date
+
 from django.db import models
 
+from listings.fields import FastJSONField
+
+_RE_OBJECT_TYPE = re.compile(r"\b(Byt|Dům|Pozemek|Garáž|Komerční|Chata)\b", re.IGNORECASE)
+_RE_ROOM_COUNT = re.compile(r"(\d{1,4})\+")
+
+
+def room_count_from_dispo(dispo):
+    """Leading room count of a disposition ("2+kk" -> 2), or None."""
+    m = _RE_ROOM_COUNT.match(dispo or "")
+    return int(m.group(1)) if m else None
+
 
 class SearchConfig(models.Model):
     """A Sreality search URL that the background scraper monitors."""
@@ -10,6 +24,9 @@ class SearchConfig(models.Model):
     is_active = models.BooleanField(default=True)
     last_scraped = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Denormalized number of listings pointing at this config; kept up to
+    # date by run_scrape and the Listing signal handlers.
+    listing_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["name"]
@@ -17,6 +34,19 @@ class SearchConfig(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # A full save from an instance loaded earlier (admin list_editable,
+        # forms) must not write back a stale listing_count; it is only
+        # written when named in update_fields.
+        if kwargs.get("update_fields") is None and not self._state.adding and not kwargs.get("force_insert"):
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                f.name
+                for f in self._meta.concrete_fields
+                if not f.primary_key and f.name != "listing_count" and f.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
 
 class Listing(models.Model):
     """One real estate listing scraped from Sreality."""
@@ -29,6 +59,8 @@ class Listing(models.Model):
     price_czk = models.BigIntegerField(null=True, blank=True)
     area_m2 = models.FloatField(null=True, blank=True)
     dispo = models.CharField(max_length=50, blank=True)
+    # Derived from dispo by room_count_from_dispo(); set on save and by run_scrape
+    room_count = models.SmallIntegerField(null=True, blank=True, db_index=True, editable=False)
     locality = models.CharField(max_length=300, blank=True)
     price_per_m2 = models.IntegerField(null=True, blank=True)
 
@@ -36,10 +68,10 @@ class Listing(models.Model):
     description = models.TextField(blank=True)
 
     # Image URLs scraped from the detail page
-    images = models.JSONField(default=list, blank=True)
+    images = FastJSONField(default=list, blank=True)
 
     # Contact info extracted from detail page {name, phone, agency}
-    contact_info = models.JSONField(default=dict, blank=True)
+    contact_info = FastJSONField(default=dict, blank=True)
 
     search_config = models.ForeignKey(
         SearchConfig,
@@ -53,10 +85,33 @@ class Listing(models.Model):
 
     class Meta:
         ordering = ["-first_seen"]
+        # Back the listing API's filter + sort combinations
+        indexes = [
+            models.Index(fields=["first_seen"]),
+            models.Index(fields=["search_config", "first_seen"]),
+            models.Index(fields=["dispo", "first_seen"]),
+            models.Index(fields=["price_czk"]),
+            models.Index(fields=["area_m2"]),
+            models.Index(fields=["price_per_m2"]),
+        ]
 
     def __str__(self):
         return f"{self.dispo} {self.locality} – {self.price_czk} Kč"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets the post_save handler recount the config a listing moved away from
+        instance._loaded_search_config_id = instance.__dict__.get("search_config_id")
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.room_count = room_count_from_dispo(self.dispo)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "dispo" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "room_count"}
+        super().save(*args, **kwargs)
+
     @property
     def offer_type(self):
         if "prodej" in self.url:
@@ -67,8 +122,7 @@ class Listing(models.Model):
 
     @property
     def object_type(self):
-        import re
-        m = re.search(r"\b(Byt|Dům|Pozemek|Garáž|Komerční|Chata)\b", self.title, re.IGNORECASE)
+        m = _RE_OBJECT_TYPE.search(self.title)
         if m:
             return m.group(1)
         return "Byt"
@@ -100,7 +154,7 @@ class OwnedProperty(models.Model):
     name = models.CharField(max_length=200)
     address = models.CharField(max_length=500, blank=True)
     description = models.TextField(blank=True)
-    photos = models.JSONField(default=list, blank=True)
+    photos = FastJSONField(default=list, blank=True)
 
     # Property details (used for price estimation)
     dispo = models.CharField(max_length=50, blank=True)   # e.g. "2+kk"
@@ -125,30 +179,33 @@ class OwnedProperty(models.Model):
     def __str__(self):
         return self.name
 
+    def _returns(self, today):
+        """Return (roi, roi_annual, years_held), sharing the base/value lookups."""
+        years = None
+        if self.purchase_date:
+            years = round((today - self.purchase_date).days / 365.25, 1)
+        base = self.total_invested or self.purchase_price
+        current = self.current_value
+        if not base or base <= 0 or not current:
+            return None, None, years
+        roi = round((current - base) / base * 100, 1)
+        roi_annual = None
+        if years and years >= 0.1:
+            roi_annual = round(((current / base) ** (1 / years) - 1) * 100, 1)
+        return roi, roi_annual, years
+
     @property
     def roi(self):
-        base = self.total_invested or self.purchase_price
-        if base and base > 0 and self.current_value:
-            return round((self.current_value - base) / base * 100, 1)
-        return None
+        return self._returns(date.today())[0]
 
     @property
     def years_held(self):
-        if not self.purchase_date:
-            return None
-        from datetime import date
-        return round((date.today() - self.purchase_date).days / 365.25, 1)
+        return self._returns(date.today())[2]
 
     @property
     def roi_annual(self):
         """CAGR — compound annual growth rate since purchase_date."""
-        years = self.years_held
-        if not years or years < 0.1:
-            return None
-        base = self.total_invested or self.purchase_price
-        if not base or base <= 0 or not self.current_value:
-            return None
-        return round(((self.current_value / base) ** (1 / years) - 1) * 100, 1)
+        return self._returns(date.today())[1]
 
     @property
     def cashflow(self):
@@ -159,6 +216,7 @@ class OwnedProperty(models.Model):
         return None
 
     def to_dict(self):
+        roi, roi_annual, years_held = self._returns(date.today())
         return {
             "id": self.pk,
             "name": self.name,
@@ -175,9 +233,9 @@ class OwnedProperty(models.Model):
             "monthly_rent": self.monthly_rent,
             "purchase_date": self.purchase_date.isoformat() if self.purchase_date else None,
             "notes": self.notes,
-            "roi": self.roi,
-            "roi_annual": self.roi_annual,
-            "years_held": self.years_held,
+            "roi": roi,
+            "roi_annual": roi_annual,
+            "years_held": years_held,
             "cashflow": self.cashflow,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
@@ -189,7 +247,7 @@ class AIAnalysis(models.Model):
     listing = models.OneToOneField(
         Listing, on_delete=models.CASCADE, related_name="aianalysis"
     )
-    analysis_json = models.JSONField()
+    analysis_json = FastJSONField()
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -0,0 +1,43 @@
+"""
+Distinct dispo / locality values for the listing filter sidebar, cached.
+
+The two DISTINCT scans only change when listings are added, edited or
+deleted, so the result is kept in the default Django cache until then.
+"""
+from __future__ import annotations
+
+from django.core.cache import cache
+
+CACHE_KEY = "filter_options_v1"
+CACHE_TIMEOUT = 3600
+
+
+def _compute() -> dict:
+    from listings.models import Listing
+
+    dispos = (
+        Listing.objects.exclude(dispo="")
+        .values_list("dispo", flat=True)
+        .distinct()
+        .order_by("dispo")
+    )
+    localities = (
+        Listing.objects.exclude(locality="")
+        .values_list("locality", flat=True)
+        .distinct()
+        .order_by("locality")
+    )
+    return {
+        "dispo": list(dispos),
+        "locality": list(localities),
+    }
+
+
+def get_filter_options() -> dict:
+    """Return {"dispo": [...], "locality": [...]}, from the cache when possible."""
+    return cache.get_or_set(CACHE_KEY, _compute, CACHE_TIMEOUT)
+
+
+def invalidate_filter_options() -> None:
+    """Drop the cached options so the next request recomputes them."""
+    cache.delete(CACHE_KEY)
@@ -0,0 +1,65 @@
+"""
+Process-wide HTTP session shared by the scraper (and anything else talking to Sreality).
+
+One SSL context and one connection pool for all callers and threads, so the
+CA bundle is parsed once and keep-alive connections are reused across scrapes.
+"""
+from __future__ import annotations
+
+import ssl
+
+import certifi
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+SSL_CTX = ssl.create_default_context(cafile=certifi.where())
+
+
+class _SharedSSLAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools all use the module-level SSL_CTX."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = SSL_CTX
+        return super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, *args, **kwargs):
+        kwargs["ssl_context"] = SSL_CTX
+        return super().proxy_manager_for(*args, **kwargs)
+
+    def cert_verify(self, conn, url, verify, cert):
+        super().cert_verify(conn, url, verify, cert)
+        if verify is True:
+            # SSL_CTX already holds the certifi bundle; leaving ca_certs set
+            # makes urllib3 call load_verify_locations() on the shared context
+            # for every new connection, from every scraper thread
+            conn.ca_certs = None
+            conn.ca_cert_dir = None
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    adapter = _SharedSSLAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "User-Agent": (
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/129.0.0.0 Safari/537.36"
+        ),
+        "Accept-Language": "cs,en;q=0.9",
+        "Connection": "keep-alive",
+    })
+    return session
+
+
+SESSION = _build_session()
@@ -1,17 +1,224 @@
 """
-Scraper service: wraps src/sreality/parser.py and saves new listings to the DB.
+Scraper service: extracts new listings from Sreality search pages and saves them to the DB.
 """
 from __future__ import annotations
 
 import logging
 import re
 import requests
-from datetime import datetime, timezone
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+from collections.abc import Container
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import accumulate
+from time import time as _now
+from urllib.parse import urljoin
+import lxml.html
+import orjson
+from django.db import transaction
+from lxml import etree
+
+from listings.services.filter_options import invalidate_filter_options
+from listings.services.http_pool import SESSION as _SESSION
 
 logger = logging.getLogger(__name__)
 
+# Disposition ("2+kk"), price ("3 500 000 Kč") or area ("45 m²") in listing text
+_RE_FIELDS = re.compile(
+    r"(?P<dispo>\b\d+\+[a-z0-9]+\b)"
+    r"|(?P<price>\d[\d\s]*\d)\s*Kč"
+    r"|(?P<area>\d+[\.,]?\d*)\s*m(?:\u00B2|2)",
+    re.IGNORECASE,
+)
+_RE_WS = re.compile(r"[\s]")
+_RE_PHONE = re.compile(
+    r"(\+420[\s\-]?\d{3}[\s\-]?\d{3}[\s\-]?\d{3}|\b\d{3}[\s\-]\d{3}[\s\-]\d{3}\b)"
+)
+_RE_PHONE_NORM = re.compile(r"[\s\-]+")
+# Detail page <img> filters: skip UI graphics, keep only photo file types
+_IMG_BLACKLIST = re.compile(r"icon|logo|favicon|placeholder|spinner|avatar", re.IGNORECASE)
+_IMG_EXT = re.compile(r"\.(?:jpe?g|png|webp)(?:$|[?#])", re.IGNORECASE)
+
+_CITIES = (
+    "Praha", "Brno", "Ostrava", "Plzeň", "Liberec",
+    "Olomouc", "Ceské Budějovice", "Hradec Králové", "Pardubice",
+    "Zlin", "Jihlava",
+)
+
+
+def _has_class_xpath(cls: str) -> str:
+    """XPath predicate equivalent of the CSS class selector ``.cls``."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+
+# Common Sreality description containers, in order of preference (the index
+# is the rank, 0 = best). Each is (kind, value): an element with CSS class
+# *value*, an element with data-testid="*value*", or a <*value*> element.
+_DESC_SELECTORS = (
+    ("class", "property-description"),
+    ("class", "description"),
+    ("testid", "description"),
+    ("class", "text-description"),
+    ("class", "text-info"),
+    ("tag", "article"),
+    ("tag", "main"),
+)
+
+
+def _desc_selector_xpath(kind: str, value: str) -> str:
+    """XPath predicate for one entry of _DESC_SELECTORS."""
+    if kind == "class":
+        return _has_class_xpath(value)
+    if kind == "testid":
+        return f"@data-testid='{value}'"
+    return f"self::{value}"
+
+
+# Every element matching any of them, in document order (one tree walk)
+_DESC_CANDIDATES_XPATH = etree.XPath(
+    "//*[{}]".format(" or ".join(_desc_selector_xpath(*sel) for sel in _DESC_SELECTORS))
+)
+
+
+def _desc_ranks(elem) -> list[int]:
+    """Preference ranks (0 = best) of the description selectors *elem* matches."""
+    classes = (elem.get("class") or "").split()
+    matched = {
+        "class": lambda value: value in classes,
+        "testid": lambda value: elem.get("data-testid") == value,
+        "tag": lambda value: elem.tag == value,
+    }
+    return [rank for rank, (kind, value) in enumerate(_DESC_SELECTORS) if matched[kind](value)]
+
+
+_OG_IMAGE_XPATH = etree.XPath("//meta[@property='og:image']/@content")
+_AUTHOR_XPATH = etree.XPath("//meta[@name='author']/@content")
+_LD_JSON_XPATH = etree.XPath("//script[@type='application/ld+json']")
+_DETAIL_LINK_XPATH = etree.XPath("//a[contains(@href, '/detail/')]")
+# Description-fallback blocks inside these are page chrome, not content
+_BLOCK_EXCLUDED_TAGS = ("nav", "footer", "script", "style")
+_RE_CHROME_TEXT = re.compile(r"navigace|footer|menu|cookie", re.IGNORECASE)
+# Visible text nodes (script/style contents are not page text)
+_TEXT_XPATH = etree.XPath("descendant-or-self::text()[not(parent::script or parent::style)]")
+
+
+def _element_text(elem) -> str:
+    """Stripped, non-empty text nodes of *elem* joined with single spaces."""
+    return " ".join(t for t in (s.strip() for s in _TEXT_XPATH(elem)) if t)
+
+
+def _walk_text(root) -> tuple[list[str], list[list[int]]]:
+    """Collect the visible text of *root* in a single traversal.
+
+    Returns (pieces, blocks): the stripped, non-empty text nodes in document
+    order, and for every <div>/<section> outside <nav>/<footer>/<script>/<style>
+    (in document order) a [start, end] slice of pieces holding its text — so
+    " ".join(pieces[start:end]) equals _element_text() of that element without
+    walking its subtree again.
+    """
+    pieces: list[str] = []
+    blocks: list[list[int]] = []
+    # Index into blocks per open <div>/<section>, -1 if it is not recorded
+    open_blocks: list[int] = []
+    pruned = 0  # number of open _BLOCK_EXCLUDED_TAGS ancestors
+    # Comments / processing instructions only contribute their tail text
+    for event, el in etree.iterwalk(root, events=("start", "end", "comment", "pi")):
+        tag = el.tag
+        if event == "start":
+            if tag in _BLOCK_EXCLUDED_TAGS:
+                pruned += 1
+            elif tag in ("div", "section"):
+                if pruned:
+                    open_blocks.append(-1)
+                else:
+                    open_blocks.append(len(blocks))
+                    blocks.append([len(pieces), len(pieces)])
+            if el.text and tag not in ("script", "style"):
+                text = el.text.strip()
+                if text:
+                    pieces.append(text)
+        else:
+            if event == "end":
+                if tag in _BLOCK_EXCLUDED_TAGS:
+                    pruned -= 1
+                elif tag in ("div", "section"):
+                    index = open_blocks.pop()
+                    if index >= 0:
+                        blocks[index][1] = len(pieces)
+            if el.tail and el is not root:
+                text = el.tail.strip()
+                if text:
+                    pieces.append(text)
+    return pieces, blocks
+
+
+# Detail pages fetched concurrently per scrape; keep <= the session pool size.
+DETAIL_FETCH_WORKERS = 8
+# Stop reading a detail page after this many bytes.
+MAX_DETAIL_PAGE_BYTES = 5 * 1024 * 1024
+
+# Listing ids already stored per SearchConfig pk, with when each set was last
+# synced with the DB. Loaded from the DB once per process and then kept up to
+# date in place, so a scrape does not have to re-materialize the whole history.
+# Later syncs only fetch ids first seen since the last one (minus an overlap
+# for transactions still in flight), which picks up listings saved by other
+# processes. Set and sync time share one entry, so a concurrent
+# forget_seen_ids() can never leave one without the other.
+_seen_ids_by_config: dict[int, tuple[set[str], datetime]] = {}
+_SEEN_SYNC_OVERLAP = timedelta(minutes=5)
+
+
+def get_seen_ids(config) -> set[str]:
+    """Return the live set of listing ids seen for *config*.
+
+    The set is shared, not copied — callers add to it in place.
+    """
+    from listings.models import Listing
+
+    now = datetime.now(tz=timezone.utc)
+    qs = Listing.objects.filter(search_config=config).order_by()
+    entry = _seen_ids_by_config.get(config.pk)
+    if entry is None:
+        seen = set(qs.values_list("listing_id", flat=True))
+    else:
+        seen, synced_at = entry
+        since = synced_at - _SEEN_SYNC_OVERLAP
+        seen.update(qs.filter(first_seen__gte=since).values_list("listing_id", flat=True))
+    _seen_ids_by_config[config.pk] = (seen, now)
+    return seen
+
+
+def discard_seen_id(config_id: int, listing_id: str) -> None:
+    """Remove one id from the cached set (if loaded) so it can be scraped again."""
+    entry = _seen_ids_by_config.get(config_id)
+    if entry is not None:
+        entry[0].discard(listing_id)
+
+
+def forget_seen_ids(config_id: int) -> None:
+    """Drop the cached seen-id set so the next scrape reloads it from the DB."""
+    _seen_ids_by_config.pop(config_id, None)
+
+
+@lru_cache(maxsize=256)
+def _strip_page(url: str) -> str:
+    """Remove every ``?page=N`` / ``&page=N`` (with its separator) from *url*."""
+    i = url.find("page=")
+    if i < 0:
+        return url
+    parts = []
+    start = 0
+    while i >= 0:
+        end = i + 5
+        while end < len(url) and url[end].isdecimal():
+            end += 1
+        if i > start and url[i - 1] in "?&" and end > i + 5:
+            parts.append(url[start:i - 1])
+            start = end
+        i = url.find("page=", end)
+    parts.append(url[start:])
+    return "".join(parts)
+
 
 def normalize_search_url(u: str, force_first_page: bool = True, cache_bust: bool = False) -> str:
     """Normalize and optionally cache-bust a Sreality search URL."""
@@ -20,60 +227,55 @@ def normalize_search_url(u: str, force_first_page: bool = True, cache_bust: bool
     url = str(u)
     if force_first_page:
         # Remove page=... query params commonly used by Sreality
-        url = re.sub(r"([?&])page=\d+", "", url)
+        url = _strip_page(url)
     if cache_bust:
         # append a short timestamp param to avoid cached results
         sep = "&" if "?" in url else "?"
-        import time
-        url = f"{url}{sep}_cb={int(time.time())}"
+        url = f"{url}{sep}_cb={_now():.0f}"
     return url
 
 
-def extract_new_listings(search_url: str, seen_ids: set, scan_limit: int = 300, take: int = 50):
+def extract_new_listings(
+    search_url: str,
+    seen_ids: Container[str],
+    scan_limit: int = 300,
+    take: int = 50,
+    session: requests.Session | None = None,
+):
     """A lightweight extractor for Sreality search pages.
     
+    Uses *session* (default: the module-wide pooled session) for the request.
+    *seen_ids* only needs membership tests (``in``), not a real set.
     Returns (new_items, total_found). Each item is a dict with keys:
     - id, url, title, price_czk, area_m2, dispo, locality, description
     """
     try:
-        resp = requests.get(search_url, timeout=15, headers={
-            "User-Agent": "Mozilla/5.0 (compatible)"
-        })
+        resp = (session or _SESSION).get(search_url, timeout=15)
         resp.raise_for_status()
     except Exception:
         raise
 
-    soup = BeautifulSoup(resp.text, "lxml")
-
-    # Extract all listing detail links
-    anchors = []
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        if "/detail/" in href:
-            full = href if href.startswith("http") else urljoin(search_url, href)
-            anchors.append((full, (a.get_text(" ") or "").strip()))
-
-    # Deduplicate preserving order
-    seen_set = set()
-    unique = []
-    for url, text in anchors:
-        if url in seen_set:
-            continue
-        seen_set.add(url)
-        unique.append((url, text))
-
-    total = len(unique)
-
+    try:
+        tree = lxml.html.fromstring(resp.text)
+    except etree.ParserError:  # empty document
+        return [], 0
+
+    # One pass over the listing detail links: dedupe by listing id and skip
+    # already-seen ids before reading any link text. Ids past scan_limit /
+    # take are only counted for the total.
+    page_ids: set[str] = set()
     items = []
-    for url, text in unique[:scan_limit]:
-        # Derive an id from the URL (last path segment)
-        try:
-            path = urlparse(url).path.rstrip("/")
-            lid = path.split("/")[-1] or url
-        except Exception:
-            lid = url
-
-        if lid in seen_ids:
+    for a in _DETAIL_LINK_XPATH(tree):
+        href = a.get("href")
+        url = href if href.startswith("http") else urljoin(search_url, href)
+        # Derive an id from the URL (last path segment, query/fragment dropped)
+        base = url.partition("?")[0].partition("#")[0].rstrip("/")
+        lid = base[base.rfind("/") + 1:] or url
+
+        if lid in page_ids:
+            continue
+        page_ids.add(lid)
+        if lid in seen_ids or len(items) >= take or len(page_ids) > scan_limit:
             continue
 
         # Parse text to extract structured fields
@@ -84,52 +286,49 @@ def extract_new_listings(search_url: str, seen_ids: set, scan_limit: int = 300,
         locality = ""
 
         # Clean up the text for parsing
-        clean_text = text.strip()
-        parts = [p.strip() for p in clean_text.split(",")]
-
-        # Try to identify fields by pattern matching
-        for part in parts:
-            part = part.strip()
-            
-            # Check if it's a disposition (2+kk, 1+1, etc.)
-            if re.match(r"^\d+\+[a-z0-9]+$", part, re.IGNORECASE):
-                dispo = part
-                continue
-            
-            # Check if it's a price (e.g., "3 500 000 Kč" or "5000000 Kč")
-            m = re.search(r"(\d[\d\s]*\d)\s*Kč", part)
-            if m and not price:
+        clean_text = " ".join(_TEXT_XPATH(a)).strip()
+
+        # One scan classifies disposition / price / area; the spans of the
+        # matches are kept for the locality lookup below.
+        spans = []
+        for m in _RE_FIELDS.finditer(clean_text):
+            spans.append((m.start(), m.end()))
+            kind = m.lastgroup
+            if kind == "dispo":
+                if not dispo:
+                    dispo = m.group("dispo")
+            elif kind == "price":
+                if not price:
+                    try:
+                        price = int(_RE_WS.sub("", m.group("price")))
+                    except Exception:
+                        pass
+            elif not area:
                 try:
-                    price = int(re.sub(r"[\s]", "", m.group(1)))
+                    area = float(m.group("area").replace(",", "."))
                 except Exception:
                     pass
-                continue
 
-            # Check if it's an area (e.g., "45 m²" or "45 m2")
-            m2 = re.search(r"(\d+[\.,]?\d*)\s*m(?:\u00B2|2)", part)
-            if m2 and not area:
-                try:
-                    area = float(m2.group(1).replace(",", "."))
-                except Exception:
-                    pass
+        # First comma part that looks like a location; parts that contained a
+        # disposition, price or area (e.g. "Prodej bytu 2+kk 54 m²") are skipped
+        end = -1
+        for part in clean_text.split(","):
+            start, end = end + 1, end + 1 + len(part)
+            if any(s < end and e > start for s, e in spans):
                 continue
-
-            # If it doesn't match above patterns and we haven't found locality, use it
-            if not locality and len(part) > 2:
-                # Check if it looks like a location (contains city name patterns)
-                if any(city in part for city in [
-                    "Praha", "Brno", "Ostrava", "Plzeň", "Liberec",
-                    "Olomouc", "Ceské Budějovice", "Hradec Králové", "Pardubice",
-                    "Praha", "Zlin", "Jihlava",
-                ]) or not any(c in part for c in ["Kč", "m²", "m2"]):
-                    locality = part
+            part = part.strip()
+            if len(part) > 2 and (
+                any(city in part for city in _CITIES)
+                or not any(c in part for c in ("Kč", "m²", "m2"))
+            ):
+                locality = part
+                break
 
         # If locality is empty, try to extract from URL or use "Česká Republika"
         if not locality:
-            # Try extracting from URL query params (if present)
-            from urllib.parse import parse_qs, urlparse as u_parse
-            parsed = u_parse(url)
-            if "region" in parsed.path.lower() or "location" in parsed.path.lower():
+            # Try extracting from the URL path (if present)
+            path = base.lower()
+            if "region" in path or "location" in path:
                 locality = "Praha"  # Default fallback
             else:
                 locality = ""
@@ -145,10 +344,7 @@ def extract_new_listings(search_url: str, seen_ids: set, scan_limit: int = 300,
             "description": "",  # Will be fetched from detail page
         })
 
-        if len(items) >= take:
-            break
-
-    return items, total
+    return items, len(page_ids)
 
 
 def _scrape_listing_detail(url: str) -> dict:
@@ -157,36 +353,30 @@ def _scrape_listing_detail(url: str) -> dict:
     Returns {"images": [...], "contact_info": {...}, "description": "..."}.
     """
     try:
-        import json
-        import re
-        import requests
-        from bs4 import BeautifulSoup
-        from urllib.parse import urljoin
-
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/129.0.0.0 Safari/537.36"
-            ),
-            "Accept-Language": "cs,en;q=0.9",
-        }
-        resp = requests.get(url, headers=headers, timeout=15)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "lxml")
+        # Stream the body straight into an incremental parser: the tree is
+        # built while bytes arrive, and oversized pages are cut off.
+        with _SESSION.get(url, timeout=15, stream=True) as resp:
+            resp.raise_for_status()
+            parser = lxml.html.HTMLParser(encoding=resp.encoding or "utf-8")
+            received = 0
+            for chunk in resp.iter_content(chunk_size=64 * 1024):
+                parser.feed(chunk)
+                received += len(chunk)
+                if received >= MAX_DETAIL_PAGE_BYTES:
+                    break
+            tree = parser.close()
 
         # ── Images ────────────────────────────────────────────────────────
         images: list[str] = []
         seen: set[str] = set()
 
-        og = soup.find("meta", attrs={"property": "og:image"})
-        if og and og.get("content"):
-            src = og["content"].strip()
+        for content in _OG_IMAGE_XPATH(tree)[:1]:
+            src = content.strip()
             if src and src not in seen:
                 images.append(src)
                 seen.add(src)
 
-        for img in soup.find_all("img"):
+        for img in tree.iter("img"):
             src = (
                 img.get("src")
                 or img.get("data-src")
@@ -201,10 +391,9 @@ def _scrape_listing_detail(url: str) -> dict:
                 continue
             if not src.startswith("http"):
                 src = urljoin(url, src)
-            low = src.lower()
-            if any(x in low for x in ["icon", "logo", "favicon", "placeholder", "spinner", "avatar"]):
+            if _IMG_BLACKLIST.search(src):
                 continue
-            if not any(ext in low for ext in [".jpg", ".jpeg", ".png", ".webp"]):
+            if not _IMG_EXT.search(src):
                 continue
             if src not in seen:
                 images.append(src)
@@ -216,10 +405,13 @@ def _scrape_listing_detail(url: str) -> dict:
         contact: dict = {}
 
         # 1) Try JSON-LD structured data (Person / RealEstateAgent / Organization)
-        for script in soup.find_all("script", type="application/ld+json"):
+        for script in _LD_JSON_XPATH(tree):
+            raw = script.text
+            if not raw:
+                continue
             try:
-                data = json.loads(script.string or "")
-                entries = data if isinstance(data, list) else [data]
+                data = orjson.loads(raw)
+                entries = data if isinstance(data, list) else (data,)
                 for entry in entries:
                     t = entry.get("@type", "")
                     if any(x in t for x in ("Person", "Agent", "Organization", "RealEstate")):
@@ -233,21 +425,21 @@ def _scrape_listing_detail(url: str) -> dict:
             except Exception:
                 pass
 
+        # Page text is walked at most once, shared by both fallbacks below
+        text_index = None
+
         # 2) Fallback: look for phone numbers in the full page text
         if not contact.get("phone"):
-            full_text = soup.get_text(" ", strip=True)
-            phone_match = re.search(
-                r"(\+420[\s\-]?\d{3}[\s\-]?\d{3}[\s\-]?\d{3}|\b\d{3}[\s\-]\d{3}[\s\-]\d{3}\b)",
-                full_text,
-            )
+            text_index = _walk_text(tree)
+            full_text = " ".join(text_index[0])
+            phone_match = _RE_PHONE.search(full_text)
             if phone_match:
-                contact["phone"] = re.sub(r"[\s\-]+", " ", phone_match.group(1)).strip()
+                contact["phone"] = _RE_PHONE_NORM.sub(" ", phone_match.group(1)).strip()
 
         # 3) Fallback: meta author / og:site_name
         if not contact.get("name"):
-            author = soup.find("meta", attrs={"name": "author"})
-            if author and author.get("content"):
-                contact["name"] = author["content"].strip()
+            for author in _AUTHOR_XPATH(tree)[:1]:
+                contact["name"] = author.strip()
 
         # Remove empty keys
         contact = {k: v for k, v in contact.items() if v}
@@ -255,33 +447,33 @@ def _scrape_listing_detail(url: str) -> dict:
         # ── Description ───────────────────────────────────────────────────
         # Try to extract main property description from common containers
         description = ""
-        
-        # Common Sreality selectors for description
-        desc_selectors = [
-            ".property-description",
-            ".description",
-            "[data-testid='description']",
-            ".text-description",
-            ".text-info",
-            "article",
-            "main",
-        ]
-        
-        for selector in desc_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                text = elem.get_text(" ", strip=True)
+
+        # First element (in document order) matching each selector, by preference
+        first_match = [None] * len(_DESC_SELECTORS)
+        for elem in _DESC_CANDIDATES_XPATH(tree):
+            for rank in _desc_ranks(elem):
+                if first_match[rank] is None:
+                    first_match[rank] = elem
+        for elem in first_match:
+            if elem is not None:
+                text = _element_text(elem)
                 if len(text) > 50:  # Only use if it's substantial
                     description = text[:2000]  # Limit to 2000 chars
                     break
-        
+
         # If no description found, try extracting from all divs with substantial text
+        # (blocks nested in <nav>/<footer> are already left out by _walk_text)
         if not description:
-            for div in soup.find_all(["div", "section"]):
-                text = div.get_text(" ", strip=True)
-                if 200 < len(text) < 5000:  # Look for medium-sized content blocks
+            pieces, blocks = text_index or _walk_text(tree)
+            # offsets[i] = sum(len(p) + 1 for p in pieces[:i]), so a slice's joined
+            # length is known without building the string
+            offsets = [0, *accumulate(len(p) + 1 for p in pieces)]
+            for start, end in blocks:
+                length = offsets[end] - offsets[start] - 1
+                if 200 < length < 5000:  # Look for medium-sized content blocks
+                    text = " ".join(pieces[start:end])
                     # Skip navigation/footer areas
-                    if not any(x in text.lower() for x in ["navigace", "footer", "menu", "cookie"]):
+                    if not _RE_CHROME_TEXT.search(text):
                         description = text[:2000]
                         break
 
@@ -301,15 +493,13 @@ def run_scrape(config) -> int:
     Scrape the search URL in *config*, save any new listings to the DB,
     update config.last_scraped, and return the count of new listings saved.
     """
-    from listings.models import Listing
+    from listings.models import Listing, room_count_from_dispo
 
     # Normalize URL (force first page, cache-bust to avoid stale results)
     url = normalize_search_url(config.url, force_first_page=True, cache_bust=True)
 
-    # Build set of already-seen listing IDs for this config
-    seen_ids: set[str] = set(
-        Listing.objects.filter(search_config=config).values_list("listing_id", flat=True)
-    )
+    # Already-seen listing IDs for this config (shared set, updated in place)
+    seen_ids = get_seen_ids(config)
 
     try:
         new_items, _total = extract_new_listings(
@@ -317,45 +507,74 @@ def run_scrape(config) -> int:
             seen_ids,
             scan_limit=300,
             take=50,
+            session=_SESSION,
         )
     except Exception as exc:
         logger.error("Scrape failed for config %s: %s", config.name, exc)
         return 0
 
-    saved = 0
-    for item in new_items:
-        try:
-            listing_url = item.get("url", "")
-            # Fetch detail page to get images, contact info, and full description
-            detail = _scrape_listing_detail(listing_url) if listing_url else {}
-            
-            # Merge detail data into item
-            description = detail.get("description", "") or item.get("description", "")
-            
-            Listing.objects.get_or_create(
+    # Fetch detail pages (images, contact info, full description) concurrently —
+    # the work is network-bound, so threads overlap the round-trips.
+    urls = [item.get("url", "") for item in new_items]
+
+    def fetch(u: str) -> dict:
+        return _scrape_listing_detail(u) if u else {}
+
+    if len(urls) > 1:
+        with ThreadPoolExecutor(max_workers=min(DETAIL_FETCH_WORKERS, len(urls))) as pool:
+            details = list(pool.map(fetch, urls))
+    else:
+        # Nothing to overlap — skip the pool (the common no-new-listings case)
+        details = [fetch(u) for u in urls]
+
+    to_create = []
+    for item, listing_url, detail in zip(new_items, urls, details):
+        # Merge detail data into item
+        description = detail.get("description", "") or item.get("description", "")
+
+        to_create.append(
+            Listing(
                 listing_id=item["id"],
-                defaults={
-                    "url": listing_url,
-                    "title": item.get("title", ""),
-                    "price_czk": item.get("price_czk"),
-                    "area_m2": item.get("area_m2"),
-                    "dispo": item.get("dispo", ""),
-                    "locality": item.get("locality", ""),
-                    "price_per_m2": item.get("price_per_m2"),
-                    "description": description,  # Use full description from detail page
-                    "images": detail.get("images", []),
-                    "contact_info": detail.get("contact_info", {}),
-                    "search_config": config,
-                },
+                url=listing_url,
+                title=item.get("title", ""),
+                price_czk=item.get("price_czk"),
+                area_m2=item.get("area_m2"),
+                dispo=item.get("dispo", ""),
+                room_count=room_count_from_dispo(item.get("dispo", "")),
+                locality=item.get("locality", ""),
+                price_per_m2=item.get("price_per_m2"),
+                description=description,  # Use full description from detail page
+                images=detail.get("images", []),
+                contact_info=detail.get("contact_info", {}),
+                search_config=config,
             )
-            saved += 1
-        except Exception as exc:
-            logger.error("Failed to save listing %s: %s", item.get("id"), exc)
+        )
 
+    # One multi-row INSERT per batch; ids already stored (e.g. under another
+    # config) are skipped by the unique constraint on listing_id. The inserts
+    # and the last_scraped update share a single transaction/commit.
+    saved = 0
     config.last_scraped = datetime.now(tz=timezone.utc)
-    config.save(update_fields=["last_scraped"])
+    try:
+        with transaction.atomic():
+            if to_create:
+                Listing.objects.bulk_create(to_create, ignore_conflicts=True, batch_size=500)
+            # ignore_conflicts hides how many rows really went in, so recount —
+            # on every scrape, which also repairs any drift from elsewhere
+            config.listing_count = Listing.objects.filter(search_config=config).count()
+            config.save(update_fields=["last_scraped", "listing_count"])
+    except Exception as exc:
+        logger.error(
+            "Failed to save %d listings for config %s: %s", len(to_create), config.name, exc
+        )
+        return 0
+
+    seen_ids.update(l.listing_id for l in to_create)
+    saved = len(to_create)
 
     if saved:
+        # New rows may bring new dispo / locality values for the sidebar
+        invalidate_filter_options()
         logger.info("Config '%s': saved %d new listings.", config.name, saved)
 
     return saved
@@ -0,0 +1,80 @@
+"""
+Model signal handlers that keep derived state (the scraper's seen ids, the
+cached filter options, SearchConfig.listing_count) in sync with the DB.
+
+Connected from ListingsConfig.ready().
+"""
+import threading
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from listings.models import Listing, SearchConfig
+from listings.services.filter_options import invalidate_filter_options
+
+# The scraper module (lxml, HTTP session, SSL context) is imported lazily in the
+# handlers so that web workers which never scrape don't load it at startup.
+
+# Config ids with a listing_count recount queued for the current transaction,
+# per database alias. Thread-local like Django's connections.
+_pending_counts = threading.local()
+
+
+def _refresh_listing_count(config_id, using):
+    # Recount rather than +/-1 so the column cannot drift
+    SearchConfig.objects.using(using).filter(pk=config_id).update(
+        listing_count=Listing.objects.using(using).filter(search_config_id=config_id).count()
+    )
+
+
+def _schedule_listing_count(config_id, using):
+    """Recount *config_id* once when the current transaction commits.
+
+    Deleting a queryset fires post_delete per row inside one transaction; every
+    row queues a callback, but only the first one per config runs the recount.
+    """
+    pending = getattr(_pending_counts, using, None)
+    if pending is None:
+        pending = set()
+        setattr(_pending_counts, using, pending)
+    pending.add(config_id)
+
+    def recount():
+        # An id left over from a rolled-back transaction is simply recounted
+        # here too; run_scrape's own recount repairs anything else
+        if config_id in pending:
+            pending.discard(config_id)
+            _refresh_listing_count(config_id, using)
+
+    transaction.on_commit(recount, using=using)
+
+
+@receiver(post_delete, sender=Listing)
+def _listing_deleted(sender, instance, using, **kwargs):
+    # A deleted listing may be scraped again — drop just its id, no reload.
+    if instance.search_config_id is not None:
+        from listings.services.scraper import discard_seen_id
+
+        discard_seen_id(instance.search_config_id, instance.listing_id)
+        _schedule_listing_count(instance.search_config_id, using)
+    invalidate_filter_options()
+
+
+@receiver(post_save, sender=Listing)
+def _listing_saved(sender, instance, using, **kwargs):
+    # Covers single saves (admin edits); run_scrape's bulk inserts invalidate
+    # and recount explicitly since bulk_create sends no signals. A listing
+    # moved to another config changes the count of both.
+    old_config_id = getattr(instance, "_loaded_search_config_id", None)
+    for config_id in {old_config_id, instance.search_config_id} - {None}:
+        _schedule_listing_count(config_id, using)
+    instance._loaded_search_config_id = instance.search_config_id
+    invalidate_filter_options()
+
+
+@receiver(post_delete, sender=SearchConfig)
+def _search_config_deleted(sender, instance, **kwargs):
+    from listings.services.scraper import forget_seen_ids
+
+    forget_seen_ids(instance.pk)
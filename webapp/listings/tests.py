@@ -0,0 +1,226 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import lxml.html
+import orjson
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+
+from listings.models import Listing, SearchConfig
+from listings.services import scraper
+from listings.services.scraper import _element_text, _walk_text, extract_new_listings
+
+
+class _FakeResponse:
+    encoding = "utf-8"
+
+    def __init__(self, text):
+        self.text = text
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        yield self.text.encode()
+
+
+class _FakeSession:
+    def __init__(self, text):
+        self.text = text
+
+    def get(self, url, **kwargs):
+        return _FakeResponse(self.text)
+
+
+def _extract(*titles):
+    html = "".join(
+        f'<a href="/detail/prodej/byt/praha/{i}">{title}</a>' for i, title in enumerate(titles)
+    )
+    items, _total = extract_new_listings(
+        "https://www.sreality.cz/hledani/prodej/byty", set(), session=_FakeSession(html)
+    )
+    return items
+
+
+class ExtractNewListingsTests(SimpleTestCase):
+    def test_sreality_title_fields_and_locality(self):
+        [item] = _extract("Prodej bytu 2+kk 54 m², Praha 5 - Smíchov, 5 990 000 Kč")
+        self.assertEqual(item["dispo"], "2+kk")
+        self.assertEqual(item["area_m2"], 54.0)
+        self.assertEqual(item["price_czk"], 5990000)
+        self.assertEqual(item["locality"], "Praha 5 - Smíchov")
+
+    def test_comma_separated_fields(self):
+        [item] = _extract("2+kk, 45 m², 3 500 000 Kč, Praha 2")
+        self.assertEqual(item["locality"], "Praha 2")
+
+    def test_part_with_field_is_never_the_locality(self):
+        [item] = _extract("Pronájem bytu 1+kk 30 m²")
+        self.assertEqual(item["locality"], "")
+
+
+def _detail_description(body):
+    session = _FakeSession(f"<html><body>{body}</body></html>")
+    with mock.patch.object(scraper, "_SESSION", session):
+        return scraper._scrape_listing_detail("https://www.sreality.cz/detail/prodej/byt/1")["description"]
+
+
+class DetailDescriptionTests(SimpleTestCase):
+    def test_selector_preference_over_document_order(self):
+        description = _detail_description(
+            f"<main>{'main ' * 20}</main>"
+            f"<div class='text-info'>{'info ' * 20}</div>"
+            f"<div class='card description'>too short</div>"
+            f"<section data-testid='description'>{'testid ' * 20}</section>"
+        )
+        # .description is preferred but too short, so data-testid wins over
+        # .text-info and <main> even though it comes last
+        self.assertEqual(description, ("testid " * 20).strip())
+
+    def test_fallback_skips_nav_footer_and_chrome_blocks(self):
+        text = "Světlý byt s balkonem " * 12
+        description = _detail_description(
+            f"<nav><div>{text}</div></nav>"
+            f"<footer><section>{text}</section></footer>"
+            f"<div>Hlavní menu {text}</div>"
+            f"<div><p>{text}</p><!-- x --><p>po rekonstrukci</p></div>"
+        )
+        self.assertEqual(description, f"{text.strip()} po rekonstrukci")
+
+    def test_fallback_block_length_bounds(self):
+        # Joined text of exactly 200 characters is too short, 201 is enough
+        short = f"<div><p>{'a' * 99}</p><p>{'b' * 100}</p></div>"
+        long = f"<div><p>{'c' * 100}</p><p>{'d' * 100}</p></div>"
+        self.assertEqual(_detail_description(short), "")
+        self.assertEqual(_detail_description(short + long), f"{'c' * 100} {'d' * 100}")
+
+
+class WalkTextTests(SimpleTestCase):
+    def test_blocks_match_element_text(self):
+        root = lxml.html.fromstring(
+            "<body>intro<div id='a'> one <b>two</b> tail<!-- c -->after"
+            "<section id='b'><script>skip()</script>three</section>four</div>"
+            "<nav><div id='n'>menu</div></nav><div id='c'></div>end</body>"
+        )
+        pieces, blocks = _walk_text(root)
+        self.assertEqual(" ".join(pieces), _element_text(root))
+        recorded = [el for el in root.iter("div", "section") if el.get("id") != "n"]
+        self.assertEqual(len(blocks), len(recorded))
+        for el, (start, end) in zip(recorded, blocks):
+            self.assertEqual(" ".join(pieces[start:end]), _element_text(el))
+
+
+class ListingCountTests(TestCase):
+    def setUp(self):
+        self.config = SearchConfig.objects.create(name="Praha", url="https://www.sreality.cz/hledani/prodej/byty")
+
+    def _create_listings(self, n):
+        for i in range(n):
+            Listing.objects.create(listing_id=str(i), url=f"https://www.sreality.cz/detail/{i}", title="", search_config=self.config)
+
+    def test_bulk_delete_recounts_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._create_listings(30)
+        self.config.refresh_from_db()
+        self.assertEqual(self.config.listing_count, 30)
+
+        # SELECT + DELETE for the rows, one recount UPDATE for the config
+        with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(3):
+            Listing.objects.filter(search_config=self.config).delete()
+        self.config.refresh_from_db()
+        self.assertEqual(self.config.listing_count, 0)
+
+    def test_moving_listing_recounts_both_configs(self):
+        other = SearchConfig.objects.create(name="Brno", url="https://www.sreality.cz/hledani/prodej/byty/brno")
+        with self.captureOnCommitCallbacks(execute=True):
+            self._create_listings(1)
+        listing = Listing.objects.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            listing.search_config = other
+            listing.save()
+        self.assertEqual(
+            dict(SearchConfig.objects.values_list("name", "listing_count")), {"Praha": 0, "Brno": 1}
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            listing.search_config = None
+            listing.save()
+        self.assertEqual(
+            dict(SearchConfig.objects.values_list("name", "listing_count")), {"Praha": 0, "Brno": 0}
+        )
+
+    def test_full_save_keeps_listing_count(self):
+        stale = SearchConfig.objects.get(pk=self.config.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self._create_listings(2)
+        stale.is_active = False
+        stale.save()
+        self.config.refresh_from_db()
+        self.assertEqual(self.config.listing_count, 2)
+        self.assertFalse(self.config.is_active)
+
+
+class ListingCursorTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user("tester"))
+        # Groups of rows sharing one first_seen, so pages split inside a tie
+        first_seen = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+        listings = Listing.objects.bulk_create(
+            Listing(listing_id=str(i), url=f"https://www.sreality.cz/detail/{i}", title="", dispo="2+kk")
+            for i in range(95)
+        )
+        for i, listing in enumerate(listings):
+            listing.first_seen = first_seen - timedelta(minutes=i // 7)
+        Listing.objects.bulk_update(listings, ["first_seen"])
+
+    def _get(self, params):
+        # List responses are streamed, so there is no response.json()
+        return orjson.loads(self.client.get("/api/listings/", params).getvalue())
+
+    def _walk(self, sort):
+        ids = []
+        params = {"sort": sort}
+        while True:
+            data = self._get(params)
+            ids += [row["id"] for row in data["results"]]
+            if not data["next_cursor"]:
+                return ids
+            params["cursor"] = data["next_cursor"]
+
+    def test_cursor_walk_has_no_duplicates_or_gaps(self):
+        for sort, order in (("newest", ("-first_seen", "-pk")), ("oldest", ("first_seen", "pk"))):
+            with self.subTest(sort=sort):
+                expected = list(Listing.objects.order_by(*order).values_list("pk", flat=True))
+                self.assertEqual(self._walk(sort), expected)
+
+    def test_cursor_with_unsupported_sort_is_rejected(self):
+        cursor = self._get({})["next_cursor"]
+        response = self.client.get("/api/listings/", {"sort": "price_asc", "cursor": cursor})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_cursor_is_rejected(self):
+        self.assertEqual(self.client.get("/api/listings/", {"cursor": "junk"}).status_code, 400)
+
+
+class SeenIdsCacheTests(TestCase):
+    def test_sync_discard_and_forget(self):
+        config = SearchConfig.objects.create(name="Praha", url="https://www.sreality.cz/hledani/prodej/byty")
+        Listing.objects.create(listing_id="1", url="https://www.sreality.cz/detail/1", title="", search_config=config)
+        self.addCleanup(scraper.forget_seen_ids, config.pk)
+
+        seen = scraper.get_seen_ids(config)
+        self.assertEqual(seen, {"1"})
+        Listing.objects.create(listing_id="2", url="https://www.sreality.cz/detail/2", title="", search_config=config)
+        # Later syncs update the same set in place
+        self.assertIs(scraper.get_seen_ids(config), seen)
+        self.assertEqual(seen, {"1", "2"})
+
+        scraper.discard_seen_id(config.pk, "1")
+        self.assertEqual(seen, {"2"})
+        scraper.forget_seen_ids(config.pk)
+        self.assertEqual(scraper.get_seen_ids(config), {"1", "2"})
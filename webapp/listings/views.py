@@ -1,82 +1,76 @@
-import json
 import logging
+import re
+from datetime import datetime, timedelta, timezone
 
+import orjson
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Q, Count
-from django.http import JsonResponse
+from django.db.models import Q, TextField
+from django.db.models.functions import Cast
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.views import View
 from django.views.generic import TemplateView
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 
-from listings.models import Listing, SearchConfig, AIAnalysis, OwnedProperty
+from listings.http import ORJSONResponse, ORJSONStreamingResponse
+from listings.models import Listing, SearchConfig, OwnedProperty
+from listings.services.filter_options import get_filter_options
 
 logger = logging.getLogger(__name__)
 
+# Leading room count of a disposition ("2" in "2+kk")
+_RE_LEADING_NUMBER = re.compile(r"^(\d+)")
+_RE_HAS_ALPHA = re.compile(r"[^\W\d_]")
+# Origin of the listing API's keyset cursors
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
 class IndexView(LoginRequiredMixin, TemplateView):
     template_name = "listings/index.html"
 
 class FilterOptionsView(LoginRequiredMixin, View):
     def get(self, request):
-        dispos = (
-            Listing.objects.exclude(dispo="")
-            .values_list("dispo", flat=True)
-            .distinct()
-            .order_by("dispo")
-        )
-        localities = (
-            Listing.objects.exclude(locality="")
-            .values_list("locality", flat=True)
-            .distinct()
-            .order_by("locality")
-        )
-        return JsonResponse(
-            {
-                "dispo": list(dispos),
-                "locality": list(localities),
-            }
-        )
+        return ORJSONResponse(get_filter_options())
 
 class ListingListView(LoginRequiredMixin, View):
     PAGE_SIZE = 40
+    # Query parameter -> (lookup, converter); empty values are ignored
+    SCALAR_FILTERS = {
+        "config_id": ("search_config_id", int),
+        "price_min": ("price_czk__gte", int),
+        "price_max": ("price_czk__lte", int),
+        "area_min": ("area_m2__gte", float),
+        "area_max": ("area_m2__lte", float),
+    }
+    # Repeatable query parameter -> __in lookup
+    LIST_FILTERS = {
+        "dispo": "dispo__in",
+        "locality": "locality__in",
+    }
 
     def get(self, request):
-        qs = Listing.objects.all()
-
-        config_id = request.GET.get("config_id")
-        if config_id:
-            qs = qs.filter(search_config_id=int(config_id))
-
-        dispos = request.GET.getlist("dispo")
-        if dispos:
-            qs = qs.filter(dispo__in=dispos)
-
-        localities = request.GET.getlist("locality")
-        if localities:
-            qs = qs.filter(locality__in=localities)
-
-        price_min = request.GET.get("price_min")
-        price_max = request.GET.get("price_max")
-        if price_min:
-            qs = qs.filter(price_czk__gte=int(price_min))
-        if price_max:
-            qs = qs.filter(price_czk__lte=int(price_max))
-
-        area_min = request.GET.get("area_min")
-        area_max = request.GET.get("area_max")
-        if area_min:
-            qs = qs.filter(area_m2__gte=float(area_min))
-        if area_max:
-            qs = qs.filter(area_m2__lte=float(area_max))
+        # Collect every filter in one pass over the query string and apply
+        # them with a single .filter() call
+        filters = {}
+        for key, values in request.GET.lists():
+            if key in self.LIST_FILTERS:
+                filters[self.LIST_FILTERS[key]] = values
+            elif key in self.SCALAR_FILTERS:
+                value = values[-1]
+                if value:
+                    lookup, convert = self.SCALAR_FILTERS[key]
+                    filters[lookup] = convert(value)
 
         search = request.GET.get("q")
         if search:
-            qs = qs.filter(
+            qs = Listing.objects.filter(
                 Q(title__icontains=search)
                 | Q(locality__icontains=search)
-                | Q(description__icontains=search)
+                | Q(description__icontains=search),
+                **filters,
             )
+        else:
+            qs = Listing.objects.filter(**filters)
 
         sort = request.GET.get("sort", "newest")
         sort_map = {
@@ -89,7 +83,51 @@ class ListingListView(LoginRequiredMixin, View):
             "price_m2_asc": "price_per_m2",
             "price_m2_desc": "-price_per_m2",
         }
-        qs = qs.order_by(sort_map.get(sort, "-first_seen"))
+        order = sort_map.get(sort, "-first_seen")
+        descending = order.startswith("-")
+        by_first_seen = order.lstrip("-") == "first_seen"
+        if by_first_seen:
+            # pk breaks ties, so (first_seen, pk) is a unique keyset cursor
+            qs = qs.order_by(order, "-pk" if descending else "pk")
+        else:
+            qs = qs.order_by(order)
+
+        # Keyset pagination: ?cursor=<first_seen epoch µs>_<pk> from a previous
+        # response's next_cursor seeks past that row, with no COUNT or OFFSET
+        cursor = request.GET.get("cursor")
+        if cursor and not by_first_seen:
+            # Price / area sorts page by number only; ignoring the cursor would
+            # hand back page 1 as if it were the next page
+            return ORJSONResponse(
+                {"error": "cursor is only supported for the newest / oldest sorts"}, status=400
+            )
+        if cursor:
+            try:
+                seen_us, _, cursor_pk = cursor.partition("_")
+                cursor_seen = _EPOCH + timedelta(microseconds=int(seen_us))
+                cursor_pk = int(cursor_pk)
+            except (ValueError, OverflowError):
+                return ORJSONResponse({"error": "invalid cursor"}, status=400)
+            if descending:
+                qs = qs.filter(
+                    Q(first_seen__lt=cursor_seen) | Q(first_seen=cursor_seen, pk__lt=cursor_pk)
+                )
+            else:
+                qs = qs.filter(
+                    Q(first_seen__gt=cursor_seen) | Q(first_seen=cursor_seen, pk__gt=cursor_pk)
+                )
+            page_pks = list(qs.values_list("pk", flat=True)[: self.PAGE_SIZE + 1])
+            has_more = len(page_pks) > self.PAGE_SIZE
+            items = self._load_page(page_pks[: self.PAGE_SIZE])
+            return ORJSONStreamingResponse(
+                {
+                    "page_size": self.PAGE_SIZE,
+                    "has_more": has_more,
+                    "next_cursor": self._cursor(items[-1]) if has_more and items else None,
+                },
+                "results",
+                (l.to_dict() for l in items),
+            )
 
         try:
             page = max(1, int(request.GET.get("page", 1)))
@@ -97,71 +135,86 @@ class ListingListView(LoginRequiredMixin, View):
             page = 1
         offset = (page - 1) * self.PAGE_SIZE
         total = qs.count()
-        items = qs.select_related("aianalysis")[offset : offset + self.PAGE_SIZE]
+        # Paginate over pks only, then load the full rows for just this page
+        page_pks = list(qs.values_list("pk", flat=True)[offset : offset + self.PAGE_SIZE])
+        items = self._load_page(page_pks)
+
+        data = {
+            "total": total,
+            "page": page,
+            "page_size": self.PAGE_SIZE,
+        }
+        if by_first_seen:
+            has_more = offset + len(items) < total
+            data["next_cursor"] = self._cursor(items[-1]) if has_more and items else None
+        # Rows are serialized one by one as the response is written
+        return ORJSONStreamingResponse(data, "results", (l.to_dict() for l in items))
 
-        return JsonResponse(
-            {
-                "total": total,
-                "page": page,
-                "page_size": self.PAGE_SIZE,
-                "results": [l.to_dict() for l in items],
-            }
+    @staticmethod
+    def _load_page(page_pks):
+        """Load the listings for *page_pks*, in that order."""
+        # to_dict() only checks whether an analysis exists, so the (large)
+        # analysis JSON is never fetched or decoded for list rows
+        by_pk = (
+            Listing.objects.select_related("aianalysis")
+            .defer("aianalysis__analysis_json")
+            .in_bulk(page_pks)
         )
+        return [by_pk[pk] for pk in page_pks if pk in by_pk]
+
+    @staticmethod
+    def _cursor(listing):
+        # Digits and "_" only, so the cursor needs no URL encoding
+        seen_us = (listing.first_seen - _EPOCH) // timedelta(microseconds=1)
+        return f"{seen_us}_{listing.pk}"
 
 class ListingDetailView(LoginRequiredMixin, View):
     def get(self, request, pk):
-        listing = get_object_or_404(Listing.objects.select_related("aianalysis"), pk=pk)
+        # The analysis is read as its stored JSON text and embedded into the
+        # response as-is, instead of being decoded and re-encoded
+        listing = get_object_or_404(
+            Listing.objects.select_related("aianalysis")
+            .defer("aianalysis__analysis_json")
+            .annotate(analysis_raw=Cast("aianalysis__analysis_json", TextField())),
+            pk=pk,
+        )
         data = listing.to_dict()
         # Include analysis if available
-        try:
-            data["analysis"] = listing.aianalysis.analysis_json
-        except AIAnalysis.DoesNotExist:
-            data["analysis"] = None
-        return JsonResponse(data)
+        raw = listing.analysis_raw
+        data["analysis"] = orjson.Fragment(raw) if raw is not None else None
+        return ORJSONResponse(data)
 
 
 @method_decorator(csrf_exempt, name="dispatch")
 class ListingAnalyzeView(LoginRequiredMixin, View):
     def post(self, request, pk):
-        listing = get_object_or_404(Listing, pk=pk)
+        # The analysis prompt doesn't use the image / contact JSON columns
+        listing = get_object_or_404(Listing.objects.defer("images", "contact_info"), pk=pk)
         try:
             from listings.services.ai import analyze_listing
 
             analysis = analyze_listing(listing)
-            return JsonResponse({"analysis": analysis})
+            return ORJSONResponse({"analysis": analysis})
         except Exception as exc:
             logger.exception("AI analysis failed for listing %d", pk)
-            return JsonResponse({"error": str(exc)}, status=500)
+            return ORJSONResponse({"error": str(exc)}, status=500)
 
 @method_decorator(csrf_exempt, name="dispatch")
 class SearchConfigListView(LoginRequiredMixin, View):
     def get(self, request):
-        configs = SearchConfig.objects.annotate(listing_count=Count("listings"))
-        return JsonResponse(
-            {
-                "results": [
-                    {
-                        "id": c.pk,
-                        "name": c.name,
-                        "url": c.url,
-                        "interval_sec": c.interval_sec,
-                        "is_active": c.is_active,
-                        "last_scraped": c.last_scraped.isoformat() if c.last_scraped else None,
-                        "listing_count": c.listing_count,
-                    }
-                    for c in configs
-                ]
-            }
+        configs = SearchConfig.objects.values(
+            "id", "name", "url", "interval_sec", "is_active", "last_scraped", "listing_count"
         )
+        return ORJSONResponse({"results": list(configs)})
 
     def post(self, request):
         try:
-            body = json.loads(request.body)
+            body = orjson.loads(request.body)
             name = body.get("name", "").strip()
             url = body.get("url", "").strip()
             interval_sec = int(body.get("interval_sec", 300))
             if not name or not url:
-                return JsonResponse({"error": "name and url are required"}, status=400)
+                return ORJSONResponse({"error": "name and url are required"}, status=400)
 
             config = SearchConfig.objects.create(
                 name=name,
@@ -178,15 +231,16 @@ class SearchConfigListView(LoginRequiredMixin, View):
             except Exception as exc:
                 logger.warning("Could not schedule config %d: %s", config.pk, exc)
 
-            return JsonResponse({"id": config.pk, "name": config.name}, status=201)
+            return ORJSONResponse({"id": config.pk, "name": config.name}, status=201)
         except Exception as exc:
-            return JsonResponse({"error": str(exc)}, status=400)
+            return ORJSONResponse({"error": str(exc)}, status=400)
 
 
 @method_decorator(csrf_exempt, name="dispatch")
 class SearchConfigDetailView(LoginRequiredMixin, View):
     def delete(self, request, pk):
-        config = get_object_or_404(SearchConfig, pk=pk)
+        # Only the pk is needed to unschedule and delete (signals included)
+        config = get_object_or_404(SearchConfig.objects.only("pk"), pk=pk)
         try:
             from listings.scheduler import unschedule_config
 
@@ -194,7 +248,7 @@ class SearchConfigDetailView(LoginRequiredMixin, View):
         except Exception:
             pass
         config.delete()
-        return JsonResponse({"deleted": pk})
+        return ORJSONResponse({"deleted": pk})
 
 @method_decorator(csrf_exempt, name="dispatch")
 class SearchConfigScrapeNowView(LoginRequiredMixin, View):
@@ -204,10 +258,10 @@ class SearchConfigScrapeNowView(LoginRequiredMixin, View):
             from listings.services.scraper import run_scrape
 
             count = run_scrape(config)
-            return JsonResponse({"new_listings": count})
+            return ORJSONResponse({"new_listings": count})
         except Exception as exc:
             logger.exception("Manual scrape failed for config %d", pk)
-            return JsonResponse({"error": str(exc)}, status=500)
+            return ORJSONResponse({"error": str(exc)}, status=500)
 
 class PropertiesView(LoginRequiredMixin, TemplateView):
     template_name = "listings/properties.html"
@@ -216,12 +270,13 @@ class PropertiesView(LoginRequiredMixin, TemplateView):
 @method_decorator(csrf_exempt, name="dispatch")
 class OwnedPropertyListView(LoginRequiredMixin, View):
     def get(self, request):
-        props = OwnedProperty.objects.all()
-        return JsonResponse({"results": [p.to_dict() for p in props]})
+        # Stream rows from the cursor instead of filling the queryset cache
+        props = OwnedProperty.objects.all().iterator(chunk_size=500)
+        return ORJSONResponse({"results": [p.to_dict() for p in props]})
 
     def post(self, request):
         try:
-            body = json.loads(request.body)
+            body = orjson.loads(request.body)
             prop = OwnedProperty.objects.create(
                 name=body.get("name", "").strip() or "Bez názvu",
                 address=body.get("address", "").strip(),
@@ -237,21 +292,21 @@ class OwnedPropertyListView(LoginRequiredMixin, View):
                 monthly_rent=body.get("monthly_rent") or None,
                 notes=body.get("notes", "").strip(),
             )
-            return JsonResponse(prop.to_dict(), status=201)
+            return ORJSONResponse(prop.to_dict(), status=201)
         except Exception as exc:
-            return JsonResponse({"error": str(exc)}, status=400)
+            return ORJSONResponse({"error": str(exc)}, status=400)
 
 
 @method_decorator(csrf_exempt, name="dispatch")
 class OwnedPropertyDetailView(LoginRequiredMixin, View):
     def get(self, request, pk):
         prop = get_object_or_404(OwnedProperty, pk=pk)
-        return JsonResponse(prop.to_dict())
+        return ORJSONResponse(prop.to_dict())
 
     def put(self, request, pk):
         prop = get_object_or_404(OwnedProperty, pk=pk)
         try:
-            body = json.loads(request.body)
+            body = orjson.loads(request.body)
             for field in ["name", "address", "description", "notes", "dispo", "purchase_date"]:
                 if field in body:
                     setattr(prop, field, body[field] or None if field == "purchase_date" else body[field])
@@ -260,14 +315,16 @@ class OwnedPropertyDetailView(LoginRequiredMixin, View):
                 if field in body:
                     setattr(prop, field, body[field] or None)
             prop.save()
-            return JsonResponse(prop.to_dict())
+            return ORJSONResponse(prop.to_dict())
         except Exception as exc:
-            return JsonResponse({"error": str(exc)}, status=400)
+            return ORJSONResponse({"error": str(exc)}, status=400)
 
     def delete(self, request, pk):
-        prop = get_object_or_404(OwnedProperty, pk=pk)
-        prop.delete()
-        return JsonResponse({"deleted": pk})
+        # No relations or signals to honour, so a single DELETE does it
+        deleted, _ = OwnedProperty.objects.filter(pk=pk).delete()
+        if not deleted:
+            raise Http404("No OwnedProperty matches the given query.")
+        return ORJSONResponse({"deleted": pk})
 
 
 class OwnedPropertyPriceEstimateView(LoginRequiredMixin, View):
@@ -283,32 +340,36 @@ class OwnedPropertyPriceEstimateView(LoginRequiredMixin, View):
     - Locality: tries progressively broader keywords until results found
     """
 
+    SIMILAR_FIELDS = (
+        "id", "title", "dispo", "locality", "price_czk",
+        "area_m2", "price_per_m2", "url", "first_seen",
+    )
+
     @staticmethod
     def _locality_candidates(address):
         """Return a list of locality keywords to try, broadest-first fallback."""
         if not address:
             return []
-        parts = [p.strip() for p in address.split(",")]
-        candidates = []
+        # Comma parts that contain letters (house numbers / postcodes are skipped)
+        parts = [p for p in (p.strip() for p in address.split(",")) if _RE_HAS_ALPHA.search(p)]
+        if not parts:
+            return []
         # Last comma part, e.g. "Praha 2" from "Kodaňská 47, Praha 2"
-        for part in reversed(parts):
-            if any(c.isalpha() for c in part):
-                candidates.append(part.strip())
-                # First word only, e.g. "Praha"
-                first_word = part.strip().split()[0]
-                if first_word != part.strip():
-                    candidates.append(first_word)
-                break
+        last = parts[-1]
+        candidates = [last]
+        # First word only, e.g. "Praha"
+        first_word = last.split()[0]
+        if first_word != last:
+            candidates.append(first_word)
         # Also try each remaining comma part (e.g. street name as fallback)
-        for part in parts:
-            kw = part.strip()
-            if kw and kw not in candidates and any(c.isalpha() for c in kw):
+        for kw in parts:
+            if kw not in candidates:
                 candidates.append(kw)
         return candidates
 
     def get(self, request, pk):
+        import heapq
         import statistics
-        import re
 
         prop = get_object_or_404(OwnedProperty, pk=pk)
 
@@ -316,11 +377,10 @@ class OwnedPropertyPriceEstimateView(LoginRequiredMixin, View):
 
         # ── Disposition filter (match same room-count family) ──────────────
         if prop.dispo:
-            m = re.match(r"^(\d+)", prop.dispo.strip())
+            m = _RE_LEADING_NUMBER.match(prop.dispo.strip())
             if m:
-                room_digit = m.group(1)
-                # Match "2+kk", "2+1", "2+2", etc.
-                base_qs = base_qs.filter(dispo__startswith=f"{room_digit}+")
+                # Match "2+kk", "2+1", "2+2", etc. (indexed integer column)
+                base_qs = base_qs.filter(room_count=int(m.group(1)))
             else:
                 base_qs = base_qs.filter(dispo__iexact=prop.dispo)
 
@@ -335,6 +395,9 @@ class OwnedPropertyPriceEstimateView(LoginRequiredMixin, View):
         locality_used = ""
         locality_candidates = self._locality_candidates(prop.address)
 
+        # Only the columns the estimate and the "similar" list need, as dicts
+        base_qs = base_qs.values(*self.SIMILAR_FIELDS)
+
         listings = []
         for kw in locality_candidates:
             qs = base_qs.filter(locality__icontains=kw).order_by("-first_seen")[:50]
@@ -350,44 +413,28 @@ class OwnedPropertyPriceEstimateView(LoginRequiredMixin, View):
             locality_used = ""
 
         if not listings:
-            return JsonResponse(
+            return ORJSONResponse(
                 {"error": "Žádné podobné inzeráty nenalezeny.", "similar": [], "count": 0,
                  "locality_keyword": ""},
                 status=200,
             )
 
-        prices_m2 = [l.price_per_m2 for l in listings if l.price_per_m2]
+        prices_m2 = [l["price_per_m2"] for l in listings if l["price_per_m2"]]
         median_pm2 = int(statistics.median(prices_m2)) if prices_m2 else None
 
         estimated_value = None
         if median_pm2 and prop.area_m2:
             estimated_value = int(median_pm2 * prop.area_m2)
 
-        # Sort by area proximity for the top-5 display
+        # Closest by area for the top-5 display (no full sort needed)
         if prop.area_m2:
-            listings_sorted = sorted(
-                listings, key=lambda l: abs((l.area_m2 or 0) - prop.area_m2)
+            similar = heapq.nsmallest(
+                5, listings, key=lambda l: abs((l["area_m2"] or 0) - prop.area_m2)
             )
         else:
-            listings_sorted = listings
+            similar = listings[:5]
 
-        top5 = listings_sorted[:5]
-        similar = [
-            {
-                "id": l.pk,
-                "title": l.title,
-                "dispo": l.dispo,
-                "locality": l.locality,
-                "price_czk": l.price_czk,
-                "area_m2": l.area_m2,
-                "price_per_m2": l.price_per_m2,
-                "url": l.url,
-                "first_seen": l.first_seen.isoformat() if l.first_seen else None,
-            }
-            for l in top5
-        ]
-
-        return JsonResponse(
+        return ORJSONResponse(
             {
                 "count": len(listings),
                 "median_price_per_m2": median_pm2,
@@ -402,16 +449,17 @@ class OwnedPropertyPriceEstimateView(LoginRequiredMixin, View):
 class OwnedPropertyPhotoUploadView(LoginRequiredMixin, View):
     def post(self, request, pk):
         import os
+        import shutil
         from django.conf import settings as django_settings
 
         prop = get_object_or_404(OwnedProperty, pk=pk)
         uploaded = request.FILES.get("photo")
         if not uploaded:
-            return JsonResponse({"error": "No file provided"}, status=400)
+            return ORJSONResponse({"error": "No file provided"}, status=400)
 
         ext = os.path.splitext(uploaded.name)[1].lower()
         if ext not in {".jpg", ".jpeg", ".png", ".webp", ".gif"}:
-            return JsonResponse({"error": "Unsupported file type"}, status=400)
+            return ORJSONResponse({"error": "Unsupported file type"}, status=400)
 
         prop_dir = django_settings.MEDIA_ROOT / "properties" / str(prop.pk)
         prop_dir.mkdir(parents=True, exist_ok=True)
@@ -420,13 +468,20 @@ class OwnedPropertyPhotoUploadView(LoginRequiredMixin, View):
         filename = f"{uuid.uuid4().hex}{ext}"
         filepath = prop_dir / filename
 
-        with open(filepath, "wb") as f:
-            for chunk in uploaded.chunks():
-                f.write(chunk)
+        if hasattr(uploaded, "temporary_file_path"):
+            # Large uploads are already spooled to a temp file: rename it into
+            # place (what FileSystemStorage does) instead of copying it
+            shutil.move(uploaded.temporary_file_path(), filepath)
+            if django_settings.FILE_UPLOAD_PERMISSIONS is not None:
+                os.chmod(filepath, django_settings.FILE_UPLOAD_PERMISSIONS)
+        else:
+            uploaded.seek(0)
+            with open(filepath, "wb") as f:
+                shutil.copyfileobj(uploaded, f, 1024 * 1024)
 
         url = f"{django_settings.MEDIA_URL}properties/{prop.pk}/{filename}"
         photos = list(prop.photos or [])
         photos.append(url)
         prop.photos = photos
         prop.save(update_fields=["photos"])
-        return JsonResponse({"url": url, "photos": photos})
+        return ORJSONResponse({"url": url, "photos": photos})
@@ -6,7 +6,7 @@ import sys
 
 def main():
     # Make the repo root (parent of webapp/) importable so that
-    # `from src.sreality.parser import ...` works inside Django.
+    # `from src.core.ai_analysis import ...` works inside Django.
     repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     if repo_root not in sys.path:
         sys.path.insert(0, repo_root)